@@ -1,49 +1,143 @@
 #!/usr/bin/env python3
 import argparse
+import functools
+import gzip
+import hashlib
+import heapq
 import json
+import math
+import os
 import re
-import statistics
 import subprocess
 import sys
+import tempfile
+import time
 import urllib.parse
 import urllib.request
 import urllib.error
+import zlib
 from collections import defaultdict
+from typing import NamedTuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+DECODE_ERRORS = (json.JSONDecodeError, gzip.BadGzipFile, EOFError, zlib.error) + (
+    (ijson.JSONError,) if ijson is not None else ()
+)
+
+_HEX_RE = re.compile(r"[0-9a-fA-F]{7,40}")
+
+_PROCESS_TAG_KEYS = frozenset({"git.commit", "service.version"})
+_ROOT_TAG_KEYS = frozenset({"git.commit", "error", "otel.status_code"})
+_STATUS_TAG_KEYS = frozenset({"error", "otel.status_code"})
+
+_TRUTHY = frozenset({"1", "true", "yes", "y"})
+_ERROR_STATUS_CODES = frozenset({"ERROR", "error", "Error"})
+
+
+def decode_json(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_json(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode("utf-8")
 
 
 def fetch_traces(jaeger_url: str, service: str, limit: int):
     query = urllib.parse.urlencode({"service": service, "limit": limit})
     url = f"{jaeger_url.rstrip('/')}/api/traces?{query}"
-    with urllib.request.urlopen(url) as resp:
-        payload = json.loads(resp.read().decode("utf-8"))
-    return payload.get("data", [])
+    req = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+    with urllib.request.urlopen(req) as resp:
+        stream = resp
+        if resp.headers.get("Content-Encoding") == "gzip":
+            stream = gzip.GzipFile(fileobj=resp)
+        if ijson is not None:
+            yield from ijson.items(stream, "data.item", use_float=True)
+            return
+        payload = decode_json(stream.read())
+    yield from payload.get("data", [])
+
+
+class Row(NamedTuple):
+    trace_id: str
+    operation: str
+    duration_sec: float
+    start_time: int
+    commit: str
+    service_version: str
+    top_child: str
+    top_child_sec: float
+    status: str
+
+
+def rows_cache_path(jaeger_url: str, service: str, limit: int, candidates=None) -> str:
+    cache_root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    key = json.dumps([jaeger_url.rstrip("/"), service, limit, candidates])
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_root, "opx", f"jaeger-{digest}.json")
+
+
+def read_rows_cache(path: str, ttl: float):
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, "rb") as f:
+            return [Row(*r) for r in decode_json(f.read())]
+    except (OSError, ValueError, TypeError):
+        return None
 
 
-def tags_to_map(tags):
+def write_rows_cache(path: str, rows):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        f = tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(path), delete=False)
+    except OSError:
+        return
+    try:
+        with f:
+            f.write(encode_json([list(r) for r in rows]))
+        os.replace(f.name, path)
+    except OSError:
+        try:
+            os.unlink(f.name)
+        except OSError:
+            pass
+
+
+def load_run_rows(args, candidates=None):
+    path = rows_cache_path(args.jaeger, args.service, args.limit, candidates)
+    if args.cache_ttl > 0:
+        rows = read_rows_cache(path, args.cache_ttl)
+        if rows is not None:
+            return rows
+    rows = collect_run_rows(fetch_traces(args.jaeger, args.service, args.limit), candidates)
+    if args.cache_ttl > 0:
+        write_rows_cache(path, rows)
+    return rows
+
+
+def pick_tags(tags, keys):
     out = {}
-    for tag in tags or []:
+    for tag in tags or ():
         key = tag.get("key")
-        if key:
+        if key in keys:
             out[key] = tag.get("value")
     return out
 
 
-def commit_matches(stored: str, query: str) -> bool:
-    if not stored or not query:
-        return False
-    s = stored.lower()
-    q = query.lower()
-    return s.startswith(q) or q.startswith(s)
-
-
-def version_matches(stored: str, query: str) -> bool:
-    if not stored or not query:
-        return False
-    s = stored.lower()
-    q = query.lower()
-    return s == q or f"v{s}" == q or (s.startswith("v") and s[1:] == q)
-
-
+@functools.lru_cache(maxsize=None)
 def resolve_ref_to_commit(selector: str) -> str:
     selector = selector.strip()
     if not selector:
@@ -63,17 +157,18 @@ def resolve_ref_to_commit(selector: str) -> str:
     return resolved or selector
 
 
+@functools.lru_cache(maxsize=None)
 def selector_candidates(selector: str):
     base = selector.strip()
     if not base:
-        return []
+        return ()
 
     candidates = [base]
     resolved = resolve_ref_to_commit(base)
     if resolved and resolved not in candidates:
         candidates.append(resolved)
 
-    if re.fullmatch(r"[0-9a-fA-F]{7,40}", base):
+    if _HEX_RE.fullmatch(base):
         pass
     elif base.startswith("v") and len(base) > 1:
         candidates.append(base[1:])
@@ -84,125 +179,181 @@ def selector_candidates(selector: str):
     for c in candidates:
         if c and c not in deduped:
             deduped.append(c)
-    return deduped
+    return tuple(deduped)
 
 
-def row_matches_selector(row, selector: str) -> bool:
-    for candidate in selector_candidates(selector):
-        if commit_matches(row.get("commit", ""), candidate):
-            return True
-        if version_matches(row.get("service_version", ""), candidate):
-            return True
-    return False
+def build_matcher(candidates):
+    lowered = tuple(c.lower() for c in candidates if c)
+    commit_prefixes = frozenset(c[:i] for c in lowered for i in range(1, len(c) + 1))
+    versions = set()
+    for c in lowered:
+        versions.add(c)
+        versions.add(f"v{c}")
+        if c.startswith("v") and len(c) > 1:
+            versions.add(c[1:])
+    versions = frozenset(versions)
+
+    def matches(commit: str, service_version: str) -> bool:
+        if commit:
+            c = commit.lower()
+            if c.startswith(lowered) or c in commit_prefixes:
+                return True
+        return bool(service_version) and service_version.lower() in versions
+
+    return matches
 
 
 def is_error_value(value) -> bool:
-    if isinstance(value, bool):
-        return value
-    if isinstance(value, (int, float)):
+    if value is True:
+        return True
+    if value is False or value is None:
+        return False
+    value_type = type(value)
+    if value_type is str:
+        if not value:
+            return False
+        return value in _TRUTHY or value.strip().lower() in _TRUTHY
+    if value_type is int or value_type is float:
         return value != 0
-    if isinstance(value, str):
-        return value.strip().lower() in {"1", "true", "yes", "y"}
     return False
 
 
+def is_error_status_code(code) -> bool:
+    return isinstance(code, str) and code in _ERROR_STATUS_CODES
+
+
 def row_matches_status(row, status_filter: str) -> bool:
-    status = row.get("status", "ok")
     if status_filter == "all":
         return True
-    return status == status_filter
+    return row.status == status_filter
 
 
 def extract_root_spans(trace):
     return [s for s in trace.get("spans", []) if not s.get("references")]
 
 
-def extract_top_child(root_span, spans):
-    root_id = root_span.get("spanID")
-    children = []
+def index_children(spans, parent_ids):
+    children_by_parent = defaultdict(list)
     for span in spans:
         for ref in span.get("references", []):
-            if ref.get("refType") == "CHILD_OF" and ref.get("spanID") == root_id:
-                children.append(span)
-                break
+            parent_id = ref.get("spanID")
+            if parent_id in parent_ids and ref.get("refType") == "CHILD_OF":
+                children_by_parent[parent_id].append(span)
+    return children_by_parent
 
-    if not children:
-        return "-", 0.0
 
-    longest = max(children, key=lambda s: s.get("duration", 0))
+def extract_top_child(root_span, children_by_parent):
+    longest = max(
+        children_by_parent.get(root_span.get("spanID"), ()),
+        key=lambda s: s.get("duration", 0),
+        default=None,
+    )
+    if longest is None:
+        return "-", 0.0
     return longest.get("operationName", "-"), longest.get("duration", 0) / 1_000_000.0
 
 
-def collect_run_rows(traces):
+def collect_run_rows(traces, candidates=None):
     rows = []
+    rows_append = rows.append
+    matches = build_matcher(candidates) if candidates is not None else None
     for trace in traces:
+        trace_id = trace.get("traceID", "-")
         spans = trace.get("spans", [])
         process_map = trace.get("processes", {})
         roots = extract_root_spans(trace)
+        children_by_parent = None
         for root in roots:
-            process_id = root.get("processID")
-            process = process_map.get(process_id, {})
-            process_tags = tags_to_map(process.get("tags", []))
-            root_tags = tags_to_map(root.get("tags", []))
-            commit = process_tags.get("git.commit") or root_tags.get("git.commit") or "unknown"
+            root_get = root.get
+            process = process_map.get(root_get("processID"), {})
+            process_tags = pick_tags(process.get("tags", []), _PROCESS_TAG_KEYS)
+            commit = process_tags.get("git.commit")
+            if commit:
+                root_tags = None
+            else:
+                root_tags = pick_tags(root_get("tags", []), _ROOT_TAG_KEYS)
+                commit = root_tags.get("git.commit") or "unknown"
             service_version = process_tags.get("service.version") or "unknown"
-            is_error = is_error_value(root_tags.get("error")) or str(
-                root_tags.get("otel.status_code", "")
-            ).upper() == "ERROR"
-            top_child_name, top_child_sec = extract_top_child(root, spans)
-            rows.append(
-                {
-                    "trace_id": trace.get("traceID", "-"),
-                    "operation": root.get("operationName", "-"),
-                    "duration_sec": root.get("duration", 0) / 1_000_000.0,
-                    "start_time": root.get("startTime", 0),
-                    "commit": commit,
-                    "service_version": service_version,
-                    "top_child": top_child_name,
-                    "top_child_sec": top_child_sec,
-                    "status": "error" if is_error else "ok",
-                }
+            if matches is not None and not matches(commit, service_version):
+                continue
+            if root_tags is None:
+                root_tags = pick_tags(root_get("tags", []), _STATUS_TAG_KEYS)
+            is_error = is_error_value(root_tags.get("error")) or is_error_status_code(
+                root_tags.get("otel.status_code")
+            )
+            if children_by_parent is None:
+                children_by_parent = index_children(spans, {r.get("spanID") for r in roots})
+            top_child_name, top_child_sec = extract_top_child(root, children_by_parent)
+            rows_append(
+                Row(
+                    trace_id=trace_id,
+                    operation=root_get("operationName", "-"),
+                    duration_sec=root_get("duration", 0) / 1_000_000.0,
+                    start_time=root_get("startTime", 0),
+                    commit=commit,
+                    service_version=service_version,
+                    top_child=top_child_name,
+                    top_child_sec=top_child_sec,
+                    status="error" if is_error else "ok",
+                )
             )
     return rows
 
 
 def latest_by_operation(rows):
-    grouped = defaultdict(list)
-    for row in rows:
-        grouped[row["operation"]].append(row)
-
     out = {}
-    for op, items in grouped.items():
-        out[op] = max(items, key=lambda x: x["start_time"])
+    for row in rows:
+        op = row.operation
+        current = out.get(op)
+        if current is None or row.start_time > current.start_time:
+            out[op] = row
     return out
 
 
 def latest_n_by_operation(rows, n):
     grouped = defaultdict(list)
     for row in rows:
-        grouped[row["operation"]].append(row)
+        grouped[row.operation].append(row)
 
     out = {}
     for op, items in grouped.items():
-        items_sorted = sorted(items, key=lambda x: x["start_time"], reverse=True)
-        out[op] = items_sorted[:n]
+        out[op] = heapq.nlargest(n, items, key=lambda x: x.start_time)
     return out
 
 
+def push_latest(heaps, row, n, seq):
+    heap = heaps.setdefault(row.operation, [])
+    entry = (row.start_time, -seq, row)
+    if len(heap) < n:
+        heapq.heappush(heap, entry)
+    else:
+        heapq.heappushpop(heap, entry)
+
+
+def drain_latest(heaps):
+    return {
+        op: [entry[2] for entry in sorted(heap, key=lambda e: e[:2], reverse=True)]
+        for op, heap in heaps.items()
+    }
+
+
 def summarize_group(rows):
     if not rows:
         return None
-    durations = [r["duration_sec"] for r in rows]
+    durations = sorted(r.duration_sec for r in rows)
+    count = len(durations)
+    mid = count // 2
+    p50 = durations[mid] if count % 2 else (durations[mid - 1] + durations[mid]) / 2
     latest = rows[0]
     return {
-        "count": len(rows),
-        "p50_sec": statistics.median(durations),
-        "avg_sec": statistics.fmean(durations),
-        "min_sec": min(durations),
-        "max_sec": max(durations),
-        "latest_trace_id": latest["trace_id"],
-        "latest_top_child": latest["top_child"],
-        "latest_top_child_sec": latest["top_child_sec"],
+        "count": count,
+        "p50_sec": p50,
+        "avg_sec": math.fsum(durations) / count,
+        "min_sec": durations[0],
+        "max_sec": durations[-1],
+        "latest_trace_id": latest.trace_id,
+        "latest_top_child": latest.top_child,
+        "latest_top_child_sec": latest.top_child_sec,
     }
 
 
@@ -210,135 +361,168 @@ def fmt_sec(value):
     return f"{value:.3f}"
 
 
-def print_header(service, base=None, head=None, commit=None, samples=1, status_filter="all"):
-    print("| key | value |")
-    print("|---|---|")
-    print(f"| service | `{service}` |")
+_REPORT_ROW = "| `{op}` | `{tid}` | {dur:.3f} | `{tc}` | {tcs:.3f} | `{st}` |".format
+_REPORT_SAMPLES_ROW = (
+    "| `{op}` | {n} | `{tid}` | {p50:.3f} | {avg:.3f} | {min:.3f} | {max:.3f} | `{tc}` | {tcs:.3f} |"
+).format
+_COMPARE_ROW = (
+    "| `{op}` | {b_trace} | {b_sec} | {b_child} | {h_trace} | {h_sec} | {h_child} | {delta} | {pct} |"
+).format
+_COMPARE_SAMPLES_ROW = (
+    "| `{op}` | {b_n} | {b_p50:.3f} | {b_avg:.3f} | {h_n} | {h_p50:.3f} | {h_avg:.3f} "
+    "| {d_p50:.3f} | {pct_p50:.3f} | {d_avg:.3f} | {pct_avg:.3f} |"
+).format
+_COMPARE_SAMPLES_PARTIAL_ROW = (
+    "| `{op}` | {b_n} | {b_p50} | {b_avg} | {h_n} | {h_p50} | {h_avg} | - | - | - | - |"
+).format
+
+
+def header_lines(service, base=None, head=None, commit=None, samples=1, status_filter="all"):
+    out = ["| key | value |", "|---|---|", f"| service | `{service}` |"]
     if commit is not None:
-        print(f"| commit | `{commit}` |")
+        out.append(f"| commit | `{commit}` |")
     if base is not None:
-        print(f"| base | `{base}` |")
+        out.append(f"| base | `{base}` |")
     if head is not None:
-        print(f"| head | `{head}` |")
-    print(f"| samples | `{samples}` |")
-    print(f"| status_filter | `{status_filter}` |")
-    print()
+        out.append(f"| head | `{head}` |")
+    out.append(f"| samples | `{samples}` |")
+    out.append(f"| status_filter | `{status_filter}` |")
+    out.append("")
+    return out
+
+
+def write_lines(lines):
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def cmd_report(args):
+    candidates = selector_candidates(args.commit)
     try:
-        traces = fetch_traces(args.jaeger, args.service, args.limit)
-    except (urllib.error.URLError, json.JSONDecodeError) as exc:
+        runs = load_run_rows(args, candidates)
+    except (urllib.error.URLError,) + DECODE_ERRORS as exc:
         print(f"Failed to fetch traces from Jaeger: {exc}", file=sys.stderr)
         return 1
-    runs = collect_run_rows(traces)
+
+    matches = build_matcher(candidates)
     selected = [
         r
         for r in runs
-        if row_matches_selector(r, args.commit) and row_matches_status(r, args.status)
+        if matches(r.commit, r.service_version) and row_matches_status(r, args.status)
     ]
 
-    if not selected:
-        print_header(
-            args.service,
-            commit=args.commit,
-            samples=args.samples,
-            status_filter=args.status,
-        )
-        print("No traces found for the specified commit.")
-        return 1
-
-    print_header(
+    out = header_lines(
         args.service,
         commit=args.commit,
         samples=args.samples,
         status_filter=args.status,
     )
+    if not selected:
+        out.append("No traces found for the specified commit.")
+        write_lines(out)
+        return 1
+
     if args.samples <= 1:
         latest = latest_by_operation(selected)
-        print("| operation | trace_id | duration_sec | top_child | top_child_sec | status |")
-        print("|---|---|---:|---|---:|---|")
+        out.append("| operation | trace_id | duration_sec | top_child | top_child_sec | status |")
+        out.append("|---|---|---:|---|---:|---|")
         for op in sorted(latest.keys()):
             row = latest[op]
-            print(
-                f"| `{op}` | `{row['trace_id']}` | {fmt_sec(row['duration_sec'])} | `{row['top_child']}` | {fmt_sec(row['top_child_sec'])} | `{row['status']}` |"
+            out.append(
+                _REPORT_ROW(
+                    op=op,
+                    tid=row.trace_id,
+                    dur=row.duration_sec,
+                    tc=row.top_child,
+                    tcs=row.top_child_sec,
+                    st=row.status,
+                )
             )
+        write_lines(out)
         return 0
 
     grouped = latest_n_by_operation(selected, args.samples)
-    print(
+    out.append(
         "| operation | samples | latest_trace_id | p50_sec | avg_sec | min_sec | max_sec | latest_top_child | latest_top_child_sec |"
     )
-    print("|---|---:|---|---:|---:|---:|---:|---|---:|")
+    out.append("|---|---:|---|---:|---:|---:|---:|---|---:|")
     for op in sorted(grouped.keys()):
         summary = summarize_group(grouped[op])
-        print(
-            f"| `{op}` | {summary['count']} | `{summary['latest_trace_id']}` | {fmt_sec(summary['p50_sec'])} | {fmt_sec(summary['avg_sec'])} | {fmt_sec(summary['min_sec'])} | {fmt_sec(summary['max_sec'])} | `{summary['latest_top_child']}` | {fmt_sec(summary['latest_top_child_sec'])} |"
+        out.append(
+            _REPORT_SAMPLES_ROW(
+                op=op,
+                n=summary["count"],
+                tid=summary["latest_trace_id"],
+                p50=summary["p50_sec"],
+                avg=summary["avg_sec"],
+                min=summary["min_sec"],
+                max=summary["max_sec"],
+                tc=summary["latest_top_child"],
+                tcs=summary["latest_top_child_sec"],
+            )
         )
+    write_lines(out)
     return 0
 
 
 def cmd_compare(args):
+    base_candidates = selector_candidates(args.base)
+    head_candidates = selector_candidates(args.head)
     try:
-        traces = fetch_traces(args.jaeger, args.service, args.limit)
-    except (urllib.error.URLError, json.JSONDecodeError) as exc:
+        runs = load_run_rows(args, tuple(dict.fromkeys(base_candidates + head_candidates)))
+    except (urllib.error.URLError,) + DECODE_ERRORS as exc:
         print(f"Failed to fetch traces from Jaeger: {exc}", file=sys.stderr)
         return 1
-    runs = collect_run_rows(traces)
 
-    base_rows = [
-        r
-        for r in runs
-        if row_matches_selector(r, args.base) and row_matches_status(r, args.status)
-    ]
-    head_rows = [
-        r
-        for r in runs
-        if row_matches_selector(r, args.head) and row_matches_status(r, args.status)
-    ]
+    base_matches = build_matcher(base_candidates)
+    head_matches = build_matcher(head_candidates)
+    n = max(args.samples, 1)
+    base_heaps = {}
+    head_heaps = {}
+    for seq, r in enumerate(runs):
+        if not row_matches_status(r, args.status):
+            continue
+        if base_matches(r.commit, r.service_version):
+            push_latest(base_heaps, r, n, seq)
+        if head_matches(r.commit, r.service_version):
+            push_latest(head_heaps, r, n, seq)
+    base_groups = drain_latest(base_heaps)
+    head_groups = drain_latest(head_heaps)
+    out = header_lines(
+        args.service,
+        base=args.base,
+        head=args.head,
+        samples=args.samples,
+        status_filter=args.status,
+    )
 
     if args.samples <= 1:
-        base_latest = latest_by_operation(base_rows)
-        head_latest = latest_by_operation(head_rows)
+        base_latest = {op: items[0] for op, items in base_groups.items()}
+        head_latest = {op: items[0] for op, items in head_groups.items()}
 
         if not base_latest and not head_latest:
-            print_header(
-                args.service,
-                base=args.base,
-                head=args.head,
-                samples=args.samples,
-                status_filter=args.status,
-            )
-            print("No traces found for either commit.")
+            out.append("No traces found for either commit.")
+            write_lines(out)
             return 1
 
         ops = sorted(set(base_latest.keys()) | set(head_latest.keys()))
-
-        print_header(
-            args.service,
-            base=args.base,
-            head=args.head,
-            samples=args.samples,
-            status_filter=args.status,
-        )
-        print("| operation | base_trace_id | base_sec | base_top_child (sec) | head_trace_id | head_sec | head_top_child (sec) | delta_sec | delta_% |")
-        print("|---|---|---:|---|---|---:|---|---:|---:|")
+        out.append("| operation | base_trace_id | base_sec | base_top_child (sec) | head_trace_id | head_sec | head_top_child (sec) | delta_sec | delta_% |")
+        out.append("|---|---|---:|---|---|---:|---|---:|---:|")
 
         for op in ops:
             b = base_latest.get(op)
             h = head_latest.get(op)
 
-            b_trace = f"`{b['trace_id']}`" if b else "-"
-            h_trace = f"`{h['trace_id']}`" if h else "-"
+            b_trace = f"`{b.trace_id}`" if b else "-"
+            h_trace = f"`{h.trace_id}`" if h else "-"
 
-            b_sec = b["duration_sec"] if b else None
-            h_sec = h["duration_sec"] if h else None
+            b_sec = b.duration_sec if b else None
+            h_sec = h.duration_sec if h else None
 
             b_child = (
-                f"`{b['top_child']}` ({fmt_sec(b['top_child_sec'])})" if b else "-"
+                f"`{b.top_child}` ({fmt_sec(b.top_child_sec)})" if b else "-"
             )
             h_child = (
-                f"`{h['top_child']}` ({fmt_sec(h['top_child_sec'])})" if h else "-"
+                f"`{h.top_child}` ({fmt_sec(h.top_child_sec)})" if h else "-"
             )
 
             if b_sec is not None and h_sec is not None:
@@ -354,34 +538,30 @@ def cmd_compare(args):
                 b_s = fmt_sec(b_sec) if b_sec is not None else "-"
                 h_s = fmt_sec(h_sec) if h_sec is not None else "-"
 
-            print(
-                f"| `{op}` | {b_trace} | {b_s} | {b_child} | {h_trace} | {h_s} | {h_child} | {delta_s} | {pct_s} |"
+            out.append(
+                _COMPARE_ROW(
+                    op=op,
+                    b_trace=b_trace,
+                    b_sec=b_s,
+                    b_child=b_child,
+                    h_trace=h_trace,
+                    h_sec=h_s,
+                    h_child=h_child,
+                    delta=delta_s,
+                    pct=pct_s,
+                )
             )
+        write_lines(out)
         return 0
 
-    base_groups = latest_n_by_operation(base_rows, args.samples)
-    head_groups = latest_n_by_operation(head_rows, args.samples)
     if not base_groups and not head_groups:
-        print_header(
-            args.service,
-            base=args.base,
-            head=args.head,
-            samples=args.samples,
-            status_filter=args.status,
-        )
-        print("No traces found for either commit.")
+        out.append("No traces found for either commit.")
+        write_lines(out)
         return 1
 
     ops = sorted(set(base_groups.keys()) | set(head_groups.keys()))
-    print_header(
-        args.service,
-        base=args.base,
-        head=args.head,
-        samples=args.samples,
-        status_filter=args.status,
-    )
-    print("| operation | base_n | base_p50 | base_avg | head_n | head_p50 | head_avg | delta_p50 | delta_p50_% | delta_avg | delta_avg_% |")
-    print("|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|")
+    out.append("| operation | base_n | base_p50 | base_avg | head_n | head_p50 | head_avg | delta_p50 | delta_p50_% | delta_avg | delta_avg_% |")
+    out.append("|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|")
 
     for op in ops:
         b = summarize_group(base_groups.get(op, []))
@@ -392,8 +572,20 @@ def cmd_compare(args):
             delta_avg = h["avg_sec"] - b["avg_sec"]
             pct_p50 = (delta_p50 / b["p50_sec"] * 100.0) if b["p50_sec"] != 0 else 0.0
             pct_avg = (delta_avg / b["avg_sec"] * 100.0) if b["avg_sec"] != 0 else 0.0
-            print(
-                f"| `{op}` | {b['count']} | {fmt_sec(b['p50_sec'])} | {fmt_sec(b['avg_sec'])} | {h['count']} | {fmt_sec(h['p50_sec'])} | {fmt_sec(h['avg_sec'])} | {fmt_sec(delta_p50)} | {fmt_sec(pct_p50)} | {fmt_sec(delta_avg)} | {fmt_sec(pct_avg)} |"
+            out.append(
+                _COMPARE_SAMPLES_ROW(
+                    op=op,
+                    b_n=b["count"],
+                    b_p50=b["p50_sec"],
+                    b_avg=b["avg_sec"],
+                    h_n=h["count"],
+                    h_p50=h["p50_sec"],
+                    h_avg=h["avg_sec"],
+                    d_p50=delta_p50,
+                    pct_p50=pct_p50,
+                    d_avg=delta_avg,
+                    pct_avg=pct_avg,
+                )
             )
             continue
 
@@ -403,10 +595,13 @@ def cmd_compare(args):
         b_avg = fmt_sec(b["avg_sec"]) if b else "-"
         h_p50 = fmt_sec(h["p50_sec"]) if h else "-"
         h_avg = fmt_sec(h["avg_sec"]) if h else "-"
-        print(
-            f"| `{op}` | {b_n} | {b_p50} | {b_avg} | {h_n} | {h_p50} | {h_avg} | - | - | - | - |"
+        out.append(
+            _COMPARE_SAMPLES_PARTIAL_ROW(
+                op=op, b_n=b_n, b_p50=b_p50, b_avg=b_avg, h_n=h_n, h_p50=h_p50, h_avg=h_avg
+            )
         )
 
+    write_lines(out)
     return 0
 
 
@@ -429,6 +624,12 @@ def main():
         default="all",
         help="Filter traces by root span status",
     )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=0,
+        help="Reuse collected rows from ~/.cache/opx for this many seconds (0 disables)",
+    )
 
     sub = parser.add_subparsers(dest="command", required=True)
 